@@ -0,0 +1,97 @@
+import sys
+import json
+import argparse
+from collections import defaultdict
+from logic_core import read_input_file, build_tseitin_cnf, propagate, add_clause
+
+def check_certificate(input_filename, cert_filename):
+    """Check a certificate written by cl4.py against its input file; return (accepted, message)"""
+    try:
+        with open(cert_filename, 'r', encoding='utf-8') as f:
+            certificate = json.load(f)
+        premises, conclusion, variables = read_input_file(input_filename)
+    except (OSError, ValueError) as e:
+        return False, f"cannot read input: {e}"
+
+    if not isinstance(certificate, dict):
+        return False, "certificate is malformed (expected a JSON object)"
+
+    # The certificate must be about exactly this problem
+    if certificate.get("premises") != premises or certificate.get("conclusion") != conclusion \
+            or certificate.get("variables") != variables:
+        return False, "certificate does not match the premises, conclusion or variables of the input file"
+
+    # Re-encode premises ∧ ¬conclusion ourselves; the last clause is the negated conclusion
+    try:
+        cnf, _ = build_tseitin_cnf(premises, conclusion, variables)
+    except ValueError as e:
+        return False, f"cannot encode input: {e}"
+
+    clauses = []
+    units = []
+    occurs = defaultdict(list)
+    for clause in cnf[:-1]:
+        add_clause(occurs, clauses, units, clause)
+
+    # Witness row: the premises alone must be satisfiable (cl4 counts vacuous arguments as invalid)
+    witness_row = certificate.get("witness")
+    if not isinstance(witness_row, dict):
+        return False, "witness row is missing or malformed"
+    values = witness_row.get("values")
+    if not isinstance(values, list) or len(values) != len(variables) \
+            or any(type(v) is not int or v not in (0, 1) for v in values):
+        return False, "witness row is missing or malformed"
+    witness = [i + 1 if v else -(i + 1) for i, v in enumerate(values)]
+    if propagate(occurs, clauses, units, witness) is None:
+        return False, f"witness row {witness_row.get('row')} does not satisfy all premises"
+
+    # The certificate is a DPLL tree: leaves must follow from the input CNF alone by reverse unit
+    # propagation, and each internal step must be the resolvent of two earlier steps. Lemmas are never
+    # added to the clause index, so each leaf check costs one propagation over the formula
+    add_clause(occurs, clauses, units, cnf[-1])
+    steps = certificate.get("steps")
+    if not isinstance(steps, list):
+        return False, "steps are missing or malformed"
+    step_clauses = []
+    for position, step in enumerate(steps, 1):
+        if not isinstance(step, dict):
+            return False, f"step {position} is malformed"
+        clause = step.get("clause")
+        parents = step.get("from")
+        if not isinstance(clause, list) or any(type(lit) is not int or lit == 0 for lit in clause) \
+                or not isinstance(parents, list) or any(type(p) is not int for p in parents):
+            return False, f"step {position} is malformed"
+        lits = set(clause)
+
+        if not parents:
+            if propagate(occurs, clauses, units, [-lit for lit in lits]) is not None:
+                return False, f"step {position} ({step.get('text')}) is not implied by unit propagation"
+        else:
+            if len(parents) != 2 or not all(1 <= p < position for p in parents):
+                return False, f"step {position} must be derived from two earlier steps"
+            left, right = step_clauses[parents[0] - 1], step_clauses[parents[1] - 1]
+            pivots = [lit for lit in left if -lit in right]
+            if len(pivots) != 1 or lits != (left - {pivots[0]}) | (right - {-pivots[0]}):
+                return False, f"step {position} ({step.get('text')}) is not the resolvent of steps {parents[0]} and {parents[1]}"
+        step_clauses.append(lits)
+
+    if not steps or step_clauses[-1]:
+        return False, "certificate does not end with the empty clause"
+
+    return True, f"{len(steps)} steps verified"
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify a cl4.py derivation certificate without enumerating the truth table.")
+    parser.add_argument('input_file', type=str, help="The premises/conclusion input file")
+    parser.add_argument('cert_file', type=str, help="The certificate file written by cl4.py (<input>.cert.json)")
+    args = parser.parse_args()
+
+    accepted, message = check_certificate(args.input_file, args.cert_file)
+    if accepted:
+        print(f"Certificate accepted: Valid ({message})")
+    else:
+        print(f"Certificate rejected: {message}")
+    sys.exit(0 if accepted else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import os
 import csv
+import json
 import itertools
 import sys
-import re
+from collections import defaultdict
+from logic_core import (BINARY_OPERATORS, build_symbol_table, parse_formula, read_input_file, build_tseitin_cnf,
+                        propagate, add_clause)
 try:
     from openpyxl import Workbook
     from openpyxl.styles import PatternFill
@@ -16,111 +19,215 @@ def xor(a, b):
     """XOR operation"""
     return a != b
 
-def parse_logical_expression(expr, variables):
-    """Parse a logical expression and return a function to evaluate it"""
-    # Clean the expression
-    expr = expr.strip()
-    original_expr = expr
-    
-    # Handle complex expressions with multiple operators more carefully
-    # First, handle XOR (⊕) in parentheses and standalone
-    expr = re.sub(r'([A-Z])\s*⊕\s*([A-Z])', r'xor(\1, \2)', expr)
-    
-    # Handle negation ¬ - be more careful with parentheses and variables
-    expr = re.sub(r'¬\(([^)]+)\)', r'(not (\1))', expr)
-    expr = re.sub(r'¬([A-Z])', r'(not \1)', expr)
-    
-    # Handle biconditional (↔) - more robust parsing
-    while '↔' in expr:
-        # Find the biconditional and split it properly
-        parts = expr.split('↔', 1)  # Split only on first occurrence
-        if len(parts) == 2:
-            left = parts[0].strip()
-            right = parts[1].strip()
-            expr = f'(({left}) == ({right}))'
-        else:
-            break
-    
-    # Handle implication (→) - more robust parsing
-    while '→' in expr:
-        parts = expr.split('→', 1)  # Split only on first occurrence
-        if len(parts) == 2:
-            left = parts[0].strip()
-            right = parts[1].strip()
-            expr = f'((not ({left})) or ({right}))'
+# Deepest parenthesis nesting allowed in generated source before a subexpression is compiled separately
+# (CPython refuses to compile expressions nested about 200 levels deep)
+MAX_NESTING = 50
+
+def formula_to_python(node, leaf, hoist=None):
+    """Render a formula tree as a Python expression, using leaf(index) for each variable
+
+    Runs of the same 'and'/'or' operator are flattened into one group. If hoist is given, any
+    subexpression nested MAX_NESTING levels deep is passed to hoist(source), which returns a
+    shallow replacement (such as a call to a separately compiled function).
+    """
+    def render(node):
+        kind = node[0]
+        if kind == 'var':
+            return leaf(node[1]), 0
+        if kind == 'not':
+            text, depth = render(node[1])
+            text, depth = f"(not {text})", depth + 1
+        elif kind in ('and', 'or'):
+            # Collect the operands of the whole run left to right
+            operands = []
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                if current[0] == kind:
+                    stack.append(current[2])
+                    stack.append(current[1])
+                else:
+                    operands.append(render(current))
+            text = "(" + f" {kind} ".join(t for t, _ in operands) + ")"
+            depth = max(d for _, d in operands) + 1
         else:
-            break
+            (left, left_depth), (right, right_depth) = render(node[1]), render(node[2])
+            if kind == 'iff':
+                text, depth = f"({left} == {right})", max(left_depth, right_depth) + 1
+            elif kind == 'implies':
+                text, depth = f"((not {left}) or {right})", max(left_depth + 2, right_depth + 1)
+            else:
+                text, depth = f"xor({left}, {right})", max(left_depth, right_depth) + 1
+        if hoist is not None and depth >= MAX_NESTING:
+            return hoist(text), 1
+        return text, depth
     
-    # Handle logical operators
-    expr = expr.replace('∧', ' and ')
-    expr = expr.replace('∨', ' or ')
+    return render(node)[0]
+
+def formula_to_text(node, variables):
+    """Render a formula tree back into input-file syntax, fully parenthesized"""
+    kind = node[0]
+    if kind == 'var':
+        return variables[node[1]]
+    if kind == 'not':
+        return f"¬{formula_to_text(node[1], variables)}"
+    symbol = {op: sym for sym, op in BINARY_OPERATORS}[kind]
+    return f"({formula_to_text(node[1], variables)} {symbol} {formula_to_text(node[2], variables)})"
+
+def parse_logical_expression(expr, variables):
+    """Parse a logical expression and return a function evaluating it on a row of values in variable order"""
+    original_expr = expr.strip()
+    node = parse_formula(original_expr, build_symbol_table(variables))
     
     print(f"Original: {original_expr}")
-    print(f"Parsed: {expr}")
-    
-    # Create a function to evaluate the expression
-    def evaluate(**kwargs):
-        # Create local variables for evaluation
-        local_vars = {}
-        for var in variables:
-            local_vars[var] = bool(kwargs.get(var, False))
-        local_vars['xor'] = xor
-        
-        try:
-            result = eval(expr, {"__builtins__": {}}, local_vars)
-            return bool(result)
-        except Exception as e:
-            print(f"Error evaluating expression: {expr}")
-            print(f"Variables: {local_vars}")
-            print(f"Error details: {e}")
-            return False
-    
-    return evaluate
-
-def read_input_file(filename):
-    """Read and parse the input file"""
-    premises = []
-    conclusion = None
-    variables = set()
-    
-    with open(filename, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # Process each line
-    for line in lines:
-        line = line.strip()
-        # Remove quotes if present
-        if line.startswith('"') and line.endswith('"'):
-            line = line[1:-1]
-        
-        # Skip empty lines and certain keywords
-        if not line or line.startswith('Variables:') or line == 'Premises:':
-            continue
+    print(f"Parsed: {formula_to_python(node, lambda i: variables[i])}")
+    
+    return compile_formula(node)
+
+def compile_formula(node):
+    """Compile a formula tree once into a function of a row of values; each variable is looked up by index"""
+    namespace = {"__builtins__": {}, "xor": xor, "bool": bool}
+    
+    # Deeply nested subexpressions become helper functions so the generated source stays shallow
+    def hoist(source):
+        name = f"_part{len(namespace)}"
+        namespace[name] = eval(f"lambda v: {source}", namespace)
+        return f"{name}(v)"
+    
+    source = formula_to_python(node, lambda i: f"v[{i}]", hoist)
+    return eval(f"lambda v: bool({source})", namespace)
+
+def formula_variables(node):
+    """Return the set of variable indices a formula tree mentions"""
+    if node[0] == 'var':
+        return {node[1]}
+    result = set()
+    for child in node[1:]:
+        result |= formula_variables(child)
+    return result
+
+def evaluate_rows_gray(premise_evaluators, conclusion_evaluator, premise_var_sets, conclusion_vars, num_vars):
+    """Evaluate every row walking assignments in Gray-code order, so exactly one variable flips per step
+
+    Only the premises (and conclusion) mentioning the flipped variable are re-evaluated, and the
+    number of false premises is updated incrementally. Returns (premise_values, premises_0s,
+    conclusion_value) per row, indexed in the lexicographic order of itertools.product.
+    """
+    # Which premises need re-evaluation when each variable flips
+    watchers = [[] for _ in range(num_vars)]
+    for p, var_set in enumerate(premise_var_sets):
+        for var in var_set:
+            watchers[var].append(p)
+    
+    values = [0] * num_vars
+    premise_values = [int(evaluator(values)) for evaluator in premise_evaluators]
+    false_count = premise_values.count(0)
+    conclusion_value = int(conclusion_evaluator(values))
+    
+    results = [None] * (2 ** num_vars)
+    for k in range(2 ** num_vars):
+        if k:
+            # Gray code k flips the bit at the position of k's lowest set bit; variable 0 is the top bit
+            var = num_vars - (k & -k).bit_length()
+            values[var] ^= 1
+            for p in watchers[var]:
+                value = int(premise_evaluators[p](values))
+                false_count += premise_values[p] - value
+                premise_values[p] = value
+            if var in conclusion_vars:
+                conclusion_value = int(conclusion_evaluator(values))
+        # The assignment reached at step k is row k ^ (k >> 1) in lexicographic order
+        results[k ^ (k >> 1)] = (list(premise_values), false_count, conclusion_value)
+    
+    return results
+
+def build_truth_table_rows(premise_evaluators, conclusion_evaluator, variables, gray_rows=None):
+    """Build the truth-table rows in Index order (from precomputed Gray-code results when given)"""
+    num_vars = len(variables)
+    num_premises = len(premise_evaluators)
+    rows = []
+    
+    for i, combination in enumerate(itertools.product([0, 1], repeat=num_vars), 1):
+        if gray_rows is not None:
+            premise_values, premises_0s, conclusion_value = gray_rows[i - 1]
+            premises_1s = num_premises - premises_0s
+            all_premises = premises_0s == 0
+        else:
+            # Evaluate all premises (evaluators look variables up by index in the combination)
+            premise_values = []
+            for evaluator in premise_evaluators:
+                try:
+                    result = evaluator(combination)
+                    premise_values.append(int(result))
+                except Exception as e:
+                    print(f"Error evaluating premise with {dict(zip(variables, combination))}: {e}")
+                    premise_values.append(0)
+            
+            # Count 0s and 1s in premises
+            premises_0s = premise_values.count(0)
+            premises_1s = premise_values.count(1)
             
-        # Find premises (numbered lines, including those starting with #)
-        premise_match = re.match(r'#*(\d+)\)\s*(.+)', line)
-        if premise_match:
-            premise = premise_match.group(2).strip()
-            # Only add premises that don't start with # (uncommented ones)
-            if not line.startswith('#'):
-                premises.append(premise)
-                # Extract variables from premise
-                vars_in_premise = re.findall(r'\b[A-Z]\b', premise)
-                variables.update(vars_in_premise)
-            continue
+            # Check if all premises are true
+            all_premises = all(premise_values)
+            
+            # Always evaluate conclusion for debugging
+            try:
+                conclusion_result = conclusion_evaluator(combination)
+                conclusion_value = int(conclusion_result)
+            except Exception as e:
+                print(f"Error evaluating conclusion with {dict(zip(variables, combination))}: {e}")
+                conclusion_value = 0
         
-        # Find conclusion
-        conclusion_match = re.match(r'Conclusion:\s*(.+)', line)
-        if conclusion_match:
-            conclusion = conclusion_match.group(1).strip()
-            # Extract variables from conclusion
-            vars_in_conclusion = re.findall(r'\b[A-Z]\b', conclusion)
-            variables.update(vars_in_conclusion)
-    
-    return premises, conclusion, sorted(list(variables))
-
-def generate_truth_table(input_filename):
-    """Generate the truth table from input file"""
+        # For display, show conclusion value only when all premises are true
+        if all_premises:
+            conclusion_str = str(conclusion_value)
+        else:
+            conclusion_str = "-"
+        
+        # Create row - add index as first column, then variables, premises, etc.
+        row = [i] + list(combination) + premise_values + [int(all_premises), conclusion_str, str(conclusion_value), premises_0s, premises_1s]
+        rows.append(row)
+    
+    return rows
+
+def summarize_validity(rows, variables, num_premises):
+    """Return (rows where all premises are true, count of those with conclusion true, validity)"""
+    # Find rows where all premises are true and count conclusions = 1
+    premise_true_rows = []
+    all_premises_col_index = len(variables) + 1 + num_premises  # Index + Variables + Premises
+    for row in rows:
+        if row[all_premises_col_index] == 1:  # All_Premises column is 1
+            premise_true_rows.append(row)
+    
+    # Count rows where conclusion is 1
+    conclusion_always_col_index = all_premises_col_index + 2  # Always column
+    conclusion_true_count = 0
+    for row in premise_true_rows:
+        if int(row[conclusion_always_col_index]) == 1:
+            conclusion_true_count += 1
+    
+    # Determine validity: argument is valid if ALL rows where premises are true also have conclusion = true
+    is_valid = len(premise_true_rows) > 0 and conclusion_true_count == len(premise_true_rows)
+    
+    return premise_true_rows, conclusion_true_count, is_valid
+
+def count_variable_values(valid_rows, variables):
+    """Count 0s and 1s of each variable over the rows where all premises are true ("-" when there are none)"""
+    var_counts_0 = {}
+    var_counts_1 = {}
+    
+    for var_index, var in enumerate(variables, 1):  # +1 because of Index column
+        if valid_rows:
+            var_counts_0[var] = sum(1 for row in valid_rows if row[var_index] == 0)
+            var_counts_1[var] = sum(1 for row in valid_rows if row[var_index] == 1)
+        else:
+            var_counts_0[var] = "-"
+            var_counts_1[var] = "-"
+    
+    return var_counts_0, var_counts_1
+
+def generate_truth_table(input_filename, gray_code=False):
+    """Generate the truth table from input file (optionally evaluating rows in Gray-code order)"""
     # Check if input file exists
     if not os.path.exists(input_filename):
         print(f"Error: Input file '{input_filename}' not found.")
@@ -153,6 +260,8 @@ def generate_truth_table(input_filename):
     base_name = os.path.splitext(input_filename)[0]
     csv_output_filename = f"{base_name}.out.csv"
     excel_output_filename = f"{base_name}.out.xlsx"
+    cert_output_filename = f"{base_name}.cert.json"
+    dag_output_filename = f"{base_name}.dag.json"
     
     # Create premise evaluators
     premise_evaluators = []
@@ -179,76 +288,17 @@ def generate_truth_table(input_filename):
     premise_cols = [f"{i+1}. {premise}" for i, premise in enumerate(premises)]
     header = ['Index'] + variables + premise_cols + ['All_Premises', conclusion, f'{conclusion} (Always)', 'Premises_0s', 'Premises_1s']
     
-    # Generate all possible combinations
-    rows = []
-    
-    for i, combination in enumerate(itertools.product([0, 1], repeat=num_vars), 1):
-        # Create variable assignment
-        var_dict = dict(zip(variables, combination))
-        
-        # Evaluate all premises
-        premise_values = []
-        for evaluator in premise_evaluators:
-            try:
-                result = evaluator(**var_dict)
-                premise_values.append(int(result))
-            except Exception as e:
-                print(f"Error evaluating premise with {var_dict}: {e}")
-                premise_values.append(0)
-        
-        # Count 0s and 1s in premises
-        premises_0s = premise_values.count(0)
-        premises_1s = premise_values.count(1)
-        
-        # Check if all premises are true
-        all_premises = all(premise_values)
-        
-        # Always evaluate conclusion for debugging
-        try:
-            conclusion_result = conclusion_evaluator(**var_dict)
-            conclusion_value = int(conclusion_result)
-        except Exception as e:
-            print(f"Error evaluating conclusion with {var_dict}: {e}")
-            conclusion_value = 0
-        
-        # For display, show conclusion value only when all premises are true
-        if all_premises:
-            conclusion_str = str(conclusion_value)
-        else:
-            conclusion_str = "-"
-        
-        # Create row - add index as first column, then variables, premises, etc.
-        row = [i] + list(combination) + premise_values + [int(all_premises), conclusion_str, str(conclusion_value), premises_0s, premises_1s]
-        rows.append(row)
-    
-    # Find rows where all premises are true and count conclusions = 1
-    premise_true_rows = []
-    for row in rows:
-        all_premises_col_index = len(variables) + 1 + len(premises)  # Index + Variables + Premises
-        if row[all_premises_col_index] == 1:  # All_Premises column is 1
-            premise_true_rows.append(row)
+    # In Gray-code mode the whole table is evaluated up front, already in Index order
+    gray_rows = None
+    if gray_code:
+        symbols = build_symbol_table(variables)
+        premise_var_sets = [formula_variables(parse_formula(premise, symbols)) for premise in premises]
+        conclusion_vars = formula_variables(parse_formula(conclusion, symbols))
+        gray_rows = evaluate_rows_gray(premise_evaluators, conclusion_evaluator, premise_var_sets, conclusion_vars, num_vars)
     
-    # Count how many of these rows have conclusion = 1
-    if len(premise_true_rows) == 0:
-        conclusion_true_count = 0
-    else:
-        # Count rows where conclusion is 1
-        conclusion_always_col_index = len(variables) + 1 + len(premises) + 2  # Always column
-        conclusion_true_count = 0
-        
-        for row in premise_true_rows:
-            row_index = row[0]
-            conclusion_value = int(row[conclusion_always_col_index])  # Always column
-            var_assignment = {var: row[i+1] for i, var in enumerate(variables)}
-            
-            if conclusion_value == 1:
-                conclusion_true_count += 1
-    
-    # Determine validity: argument is valid if ALL rows where premises are true also have conclusion = true
-    is_valid = len(premise_true_rows) > 0 and conclusion_true_count == len(premise_true_rows)
-    
-    # Keep valid_rows for compatibility with rest of code
-    valid_rows = premise_true_rows
+    # Generate all possible combinations
+    rows = build_truth_table_rows(premise_evaluators, conclusion_evaluator, variables, gray_rows)
+    valid_rows, conclusion_true_count, is_valid = summarize_validity(rows, variables, num_premises)
     
     # Print the same detailed statistics that appear in the files
     print(f"# of variables: {num_vars}")
@@ -270,18 +320,15 @@ def generate_truth_table(input_filename):
         print(f" Argument validity: {conclusion_true_count} (Count of rows where conclusion is true)")
         print(f" Argument validity: {conclusion_true_count} ({'Valid' if is_valid else 'Invalid'})")
     
-    # Count 0s and 1s for each variable when All_Premises=1
-    var_counts_0 = {}
-    var_counts_1 = {}
+    # For valid arguments, emit a certificate that can be checked without the full table
+    if is_valid:
+        try:
+            write_certificate(cert_output_filename, dag_output_filename, premises, conclusion, variables, valid_rows[0])
+        except ValueError as e:
+            print(f"Error building certificate: {e}")
     
-    for var in variables:
-        var_index = variables.index(var) + 1  # +1 because of Index column
-        if valid_rows:
-            var_counts_0[var] = sum(1 for row in valid_rows if row[var_index] == 0)
-            var_counts_1[var] = sum(1 for row in valid_rows if row[var_index] == 1)
-        else:
-            var_counts_0[var] = "-"
-            var_counts_1[var] = "-"
+    # Count 0s and 1s for each variable when All_Premises=1
+    var_counts_0, var_counts_1 = count_variable_values(valid_rows, variables)
     
     # Create the summary row showing argument validity
     summary_row = ["-"] + ["-"] * len(variables)  # Index + variable columns
@@ -495,6 +542,242 @@ def handle_permission_error(output_filename, header, rows, summary_row, count_0_
         print(f"Argument validity: {conclusion_true_count} (Count of rows where conclusion is true)")
         print(f"Argument validity: {conclusion_true_count} ({'Valid' if is_valid else 'Invalid'})")
 
+def compute_truth_columns(premise_evaluators, conclusion_evaluator, variables):
+    """Evaluate each premise and the conclusion once per row, packing each column into an integer bitmask"""
+    num_rows = 2 ** len(variables)
+    
+    # Collect each column as ASCII '0'/'1' digits and convert to an int once; OR-ing bits into a
+    # growing int on every row would copy the whole mask each time
+    premise_columns = [bytearray(b'0' * num_rows) for _ in premise_evaluators]
+    conclusion_column = bytearray(b'0' * num_rows)
+    
+    for r, combination in enumerate(itertools.product([0, 1], repeat=len(variables))):
+        for p, evaluator in enumerate(premise_evaluators):
+            if evaluator(combination):
+                premise_columns[p][r] = ord('1')
+        if conclusion_evaluator(combination):
+            conclusion_column[r] = ord('1')
+    
+    # Bit r of a mask is the value in row r+1 of the truth table (same order as the Index column),
+    # so the digit string is reversed to put row 1 in the lowest bit
+    def to_mask(column):
+        return int(bytes(column[::-1]), 2)
+    
+    return [to_mask(column) for column in premise_columns], to_mask(conclusion_column)
+
+def combine_premises(premise_masks, indices, full_mask):
+    """Return the All_Premises column (as a bitmask) for the given subset of premises"""
+    mask = full_mask
+    for i in indices:
+        mask &= premise_masks[i]
+    return mask
+
+def find_minimal_unsat_core(premise_masks, full_mask):
+    """Return the indices of a minimal unsatisfiable subset of premises, or None if the premises are consistent"""
+    core = list(range(len(premise_masks)))
+    if combine_premises(premise_masks, core, full_mask):
+        return None
+    
+    # Deletion-based shrinking: drop a premise whenever the rest stay inconsistent
+    for i in list(core):
+        trial = [j for j in core if j != i]
+        if not combine_premises(premise_masks, trial, full_mask):
+            core = trial
+    
+    return core
+
+def combine_other_premises(premise_masks, full_mask):
+    """Return, for each premise i, the All_Premises column of every premise except i"""
+    n = len(premise_masks)
+    
+    # prefix[i] = AND of premises before i, suffix[i] = AND of premises from i on
+    prefix = [full_mask] * (n + 1)
+    suffix = [full_mask] * (n + 1)
+    for i in range(n):
+        prefix[i + 1] = prefix[i] & premise_masks[i]
+    for i in range(n - 1, -1, -1):
+        suffix[i] = suffix[i + 1] & premise_masks[i]
+    
+    return [prefix[i] & suffix[i + 1] for i in range(n)]
+
+def find_redundant_premises(premise_masks, full_mask):
+    """Return the indices of premises that are implied by all the other premises"""
+    others = combine_other_premises(premise_masks, full_mask)
+    return [i for i in range(len(premise_masks)) if not (others[i] & ~premise_masks[i] & full_mask)]
+
+def find_necessary_premises(premise_masks, conclusion_mask, full_mask):
+    """Return the indices of premises without which the remaining premises no longer entail the conclusion"""
+    others = combine_other_premises(premise_masks, full_mask)
+    return [i for i in range(len(premise_masks)) if others[i] & ~conclusion_mask & full_mask]
+
+def find_conclusion_dependencies(premise_masks, conclusion_mask, full_mask):
+    """Return the indices of a minimal subset of premises that still entails the conclusion, or None if none does"""
+    def entails(indices):
+        return not (combine_premises(premise_masks, indices, full_mask) & ~conclusion_mask & full_mask)
+    
+    support = list(range(len(premise_masks)))
+    if not entails(support):
+        return None
+    
+    # Deletion-based shrinking: drop a premise whenever the rest still entail the conclusion
+    for i in list(support):
+        trial = [j for j in support if j != i]
+        if entails(trial):
+            support = trial
+    
+    return support
+
+def analyze_premises(input_filename):
+    """Report the unsatisfiable core, redundant premises and conclusion dependencies of an input file"""
+    # Check if input file exists
+    if not os.path.exists(input_filename):
+        print(f"Error: Input file '{input_filename}' not found.")
+        return
+    
+    # Read and parse input file
+    try:
+        premises, conclusion, variables = read_input_file(input_filename)
+    except Exception as e:
+        print(f"Error reading input file: {e}")
+        return
+    
+    if not premises:
+        print("No premises found in input file.")
+        return
+    
+    if not conclusion:
+        print("No conclusion found in input file.")
+        return
+    
+    print(f"Found {len(premises)} premises and 1 conclusion")
+    print(f"Variables: {variables}")
+    
+    try:
+        premise_evaluators = [parse_logical_expression(premise, variables) for premise in premises]
+        conclusion_evaluator = parse_logical_expression(conclusion, variables)
+    except Exception as e:
+        print(f"Error parsing expression: {e}")
+        return
+    
+    # One pass over the truth table; every subset check after this is a bitwise AND
+    premise_masks, conclusion_mask = compute_truth_columns(premise_evaluators, conclusion_evaluator, variables)
+    full_mask = (1 << (2 ** len(variables))) - 1
+    
+    def describe(indices):
+        for i in indices:
+            print(f"  {i+1}. {premises[i]}")
+    
+    core = find_minimal_unsat_core(premise_masks, full_mask)
+    if core is None:
+        print("\nPremises are consistent (no unsatisfiable core).")
+    else:
+        print(f"\nPremises are inconsistent. Minimal unsatisfiable core ({len(core)} premises):")
+        describe(core)
+    
+    redundant = find_redundant_premises(premise_masks, full_mask)
+    if redundant:
+        print(f"\nRedundant premises (each implied by the others): {len(redundant)}")
+        describe(redundant)
+        print("  Note: removing one redundant premise may make another one necessary.")
+    else:
+        print("\nNo redundant premises.")
+    
+    support = find_conclusion_dependencies(premise_masks, conclusion_mask, full_mask)
+    if support is None:
+        print("\nConclusion is not entailed by the premises (argument invalid), no dependencies.")
+    else:
+        necessary = find_necessary_premises(premise_masks, conclusion_mask, full_mask)
+        if not support:
+            print("\nConclusion is a tautology; it needs no premises.")
+        else:
+            if necessary:
+                print(f"\nPremises the conclusion necessarily depends on (the rest do not entail it without each one): {len(necessary)}")
+                describe(necessary)
+            else:
+                print("\nNo single premise is necessary for the conclusion (each can be replaced by others).")
+            print(f"\nA minimal supporting subset ({len(support)} of {len(premises)} premises; others may exist):")
+            describe(support)
+        if core is not None:
+            print("  Note: premises are inconsistent, so every conclusion is entailed by the full set.")
+
+def prove_unsat(clauses, num_decision_vars):
+    """Build a RUP refutation of the clauses by DPLL over the table variables, or return None if satisfiable"""
+    steps = []
+    
+    # Index the input clauses by literal. The lemmas are not added: they only mention literals on
+    # their own search path, so they cannot prune any other branch of this search
+    database = []
+    units = []
+    occurs = defaultdict(list)
+    for clause in clauses:
+        add_clause(occurs, database, units, clause)
+    
+    # Each step is (clause, child step numbers); a step is RUP with respect to the clauses and earlier steps.
+    # A child only propagates its new decision on top of its parent's assignment; a checker that
+    # propagates from scratch with more clauses derives at least as much, so leaf conflicts still check.
+    def refute(decisions, parent_assigned):
+        if parent_assigned is None:
+            assigned = propagate(occurs, database, units, decisions)
+        else:
+            assigned = propagate(occurs, database, units, decisions[-1:], parent_assigned)
+        children = []
+        if assigned is not None:
+            var = next((v for v in range(1, num_decision_vars + 1) if v not in assigned and -v not in assigned), None)
+            if var is None:
+                return None
+            for lit in (var, -var):
+                child = refute(decisions + [lit], assigned)
+                if child is None:
+                    return None
+                children.append(child)
+        lemma = [-lit for lit in decisions]
+        steps.append((lemma, children))
+        return len(steps)
+    
+    if refute([], None) is None:
+        return None
+    return steps
+
+def format_clause(clause, variables):
+    """Render a clause over the table variables, e.g. ¬A ∨ B"""
+    if not clause:
+        return "⊥"
+    return " ∨ ".join(variables[lit - 1] if lit > 0 else f"¬{variables[-lit - 1]}" for lit in clause)
+
+def write_certificate(cert_filename, dag_filename, premises, conclusion, variables, witness_row):
+    """Write a derivation certificate for a valid argument, plus its L-DAG edge file for dag_DFS.py"""
+    clauses, _ = build_tseitin_cnf(premises, conclusion, variables)
+    steps = prove_unsat(clauses, len(variables))
+    if steps is None:
+        print("Error: could not derive a refutation of premises ∧ ¬conclusion.")
+        return
+    
+    certificate = {
+        "variables": variables,
+        "premises": premises,
+        "conclusion": conclusion,
+        "witness": {"row": witness_row[0], "values": list(witness_row[1:len(variables) + 1])},
+        "steps": [
+            {"step": i, "clause": clause, "text": format_clause(clause, variables), "from": children}
+            for i, (clause, children) in enumerate(steps, 1)
+        ],
+    }
+    edges = [[child, i] for i, (_, children) in enumerate(steps, 1) for child in children]
+    
+    try:
+        with open(cert_filename, 'w', encoding='utf-8') as f:
+            json.dump(certificate, f, ensure_ascii=False, indent=1)
+        if edges:
+            with open(dag_filename, 'w', encoding='utf-8') as f:
+                json.dump(edges, f)
+    except PermissionError:
+        print(f"\nError: Cannot write to '{cert_filename}' - file may be open in another program.")
+        return
+    
+    print(f"\nCertificate ({len(steps)} steps) saved to: {cert_filename}")
+    if edges:
+        print(f"L-DAG edges saved to: {dag_filename}")
+
 def test_your_input():
     """Test function for your specific input"""
     variables = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
@@ -548,12 +831,12 @@ def test_your_input():
         
         premise_results = []
         for j, evaluator in enumerate(premise_evaluators):
-            result = evaluator(**test_case)
+            result = evaluator([test_case[var] for var in variables])
             premise_results.append(result)
             print(f"  Premise {j+1}: {result}")
         
         all_premises = all(premise_results)
-        conclusion_result = conclusion_evaluator(**test_case)
+        conclusion_result = conclusion_evaluator([test_case[var] for var in variables])
         
         print(f"  All premises true: {all_premises}")
         print(f"  Conclusion: {conclusion_result}")
@@ -573,7 +856,7 @@ def test_expression():
     
     # Test case from Row 2
     test_vars = {'B': 1, 'C': 0, 'D': 0, 'G': 0}
-    result = evaluator(**test_vars)
+    result = evaluator([test_vars[var] for var in variables])
     
     print(f"\nOriginal test case:")
     print(f"Expression: {expr}")
@@ -602,9 +885,19 @@ def main():
         test_expression()
         return
     
+    if len(sys.argv) == 3 and sys.argv[1] == "analyze":
+        analyze_premises(sys.argv[2])
+        return
+    
+    if len(sys.argv) == 3 and sys.argv[1] == "gray":
+        generate_truth_table(sys.argv[2], gray_code=True)
+        return
+    
     if len(sys.argv) != 2:
         print("Usage: python script.py <input_filename>")
         print("       python script.py test  (for testing)")
+        print("       python script.py analyze <input_filename>  (unsatisfiable core / redundant premises)")
+        print("       python script.py gray <input_filename>  (Gray-code row evaluation, same output)")
         print("Example: python script.py problem.txt")
         print("\nInput file format:")
         print("1) premise1")
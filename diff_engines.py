@@ -0,0 +1,398 @@
+import os
+import csv
+import sys
+import glob
+import time
+import random
+import argparse
+import itertools
+from cl4 import (read_input_file, build_symbol_table, parse_formula, compile_formula, formula_variables,
+                 formula_to_text, evaluate_rows_gray, build_truth_table_rows, summarize_validity,
+                 count_variable_values, compute_truth_columns, combine_premises, build_tseitin_cnf, prove_unsat)
+
+# Operators used by the random formula generator
+RANDOM_OPERATORS = ['not', 'and', 'or', 'xor', 'implies', 'iff']
+
+# Intended grammar of the input syntax, used to check the parser (higher binds tighter)
+GRAMMAR_PRECEDENCE = {'iff': 1, 'implies': 2, 'or': 3, 'and': 4, 'xor': 5}
+GRAMMAR_SYMBOLS = {'iff': '↔', 'implies': '→', 'or': '∨', 'and': '∧', 'xor': '⊕'}
+RIGHT_ASSOCIATIVE = {'iff', 'implies'}
+
+def evaluate_formula(node, values):
+    """Evaluate a formula tree directly (tree-walking interpreter, independent of compile_formula)"""
+    kind = node[0]
+    if kind == 'var':
+        return bool(values[node[1]])
+    if kind == 'not':
+        return not evaluate_formula(node[1], values)
+    a = evaluate_formula(node[1], values)
+    b = evaluate_formula(node[2], values)
+    if kind == 'and':
+        return a and b
+    if kind == 'or':
+        return a or b
+    if kind == 'xor':
+        return a != b
+    if kind == 'implies':
+        return (not a) or b
+    return a == b
+
+def table_result(rows, conclusion_true_count, ones):
+    """Validity as cl4.py defines it (some row satisfies all premises and all such rows satisfy the conclusion),
+    plus per-variable (0s, 1s) counts over those rows given each variable's count of 1s, "-" when there are none"""
+    counts = [(len(rows) - count, count) if rows else ("-", "-") for count in ones]
+    return {"valid": len(rows) > 0 and conclusion_true_count == len(rows), "rows": rows, "counts": counts}
+
+def truth_table_result(premise_nodes, conclusion_node, variables, gray_code):
+    """Run the table-building path of generate_truth_table (default or Gray-code mode) on formula trees"""
+    premise_evaluators = [compile_formula(node) for node in premise_nodes]
+    conclusion_evaluator = compile_formula(conclusion_node)
+    gray_rows = None
+    if gray_code:
+        gray_rows = evaluate_rows_gray(premise_evaluators, conclusion_evaluator,
+                                       [formula_variables(node) for node in premise_nodes],
+                                       formula_variables(conclusion_node), len(variables))
+    table = build_truth_table_rows(premise_evaluators, conclusion_evaluator, variables, gray_rows)
+    valid_rows, conclusion_true_count, is_valid = summarize_validity(table, variables, len(premise_nodes))
+    var_counts_0, var_counts_1 = count_variable_values(valid_rows, variables)
+    return {"valid": is_valid, "rows": [row[0] for row in valid_rows],
+            "counts": [(var_counts_0[var], var_counts_1[var]) for var in variables], "table": table}
+
+def run_product(premise_nodes, conclusion_node, variables):
+    """Reference engine: the rows, counts and validity generate_truth_table writes (cl4.py <file>)"""
+    return truth_table_result(premise_nodes, conclusion_node, variables, gray_code=False)
+
+def run_gray(premise_nodes, conclusion_node, variables):
+    """Gray-code incremental evaluation re-indexed into the table generate_truth_table writes (cl4.py gray)"""
+    return truth_table_result(premise_nodes, conclusion_node, variables, gray_code=True)
+
+def run_tree(premise_nodes, conclusion_node, variables):
+    """Tree-walking interpreter over itertools.product"""
+    rows = []
+    conclusion_true_count = 0
+    ones = [0] * len(variables)
+    for i, combination in enumerate(itertools.product([0, 1], repeat=len(variables)), 1):
+        if all(evaluate_formula(node, combination) for node in premise_nodes):
+            rows.append(i)
+            conclusion_true_count += evaluate_formula(conclusion_node, combination)
+            ones = [count + value for count, value in zip(ones, combination)]
+    return table_result(rows, conclusion_true_count, ones)
+
+def run_bitmask(premise_nodes, conclusion_node, variables):
+    """Per-premise truth columns packed into integer bitmasks (cl4.py analyze)"""
+    # Each variable is also evaluated as a column of its own, so its counts are popcounts of masks
+    variable_evaluators = [compile_formula(('var', j)) for j in range(len(variables))]
+    masks, conclusion_mask = compute_truth_columns([compile_formula(node) for node in premise_nodes] + variable_evaluators,
+                                                   compile_formula(conclusion_node), variables)
+    premise_masks, variable_masks = masks[:len(premise_nodes)], masks[len(premise_nodes):]
+    full_mask = (1 << (2 ** len(variables))) - 1
+    all_premises = combine_premises(premise_masks, range(len(premise_masks)), full_mask)
+    rows = [r + 1 for r in range(2 ** len(variables)) if all_premises >> r & 1]
+    ones = [bin(all_premises & mask).count('1') for mask in variable_masks]
+    return table_result(rows, bin(all_premises & conclusion_mask).count('1'), ones)
+
+def run_cnf(premise_nodes, conclusion_node, variables):
+    """Tseitin CNF + DPLL refutation (certificate path); decides validity only"""
+    premises = [formula_to_text(node, variables) for node in premise_nodes]
+    clauses, _ = build_tseitin_cnf(premises, formula_to_text(conclusion_node, variables), variables)
+    # The last clause is the negated conclusion; without it the search only asks whether the premises are consistent
+    consistent = prove_unsat(clauses[:-1], len(variables)) is None
+    return {"valid": consistent and prove_unsat(clauses, len(variables)) is not None, "rows": None, "counts": None}
+
+# (name, engine, whether it enumerates the truth table); the first engine is the reference
+ENGINES = [('product', run_product, True), ('tree', run_tree, True), ('gray', run_gray, True),
+           ('bitmask', run_bitmask, True), ('cnf', run_cnf, False)]
+
+def run_engines(instance, stats=None):
+    """Run every engine on an instance; return a list of mismatch descriptions against the reference engine"""
+    premise_nodes, conclusion_node, variables = instance
+    results = {}
+    for name, engine, enumerates_rows in ENGINES:
+        start = time.perf_counter()
+        try:
+            results[name] = engine(premise_nodes, conclusion_node, variables)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        if stats is not None:
+            stats[name]["instances"] += 1
+            if enumerates_rows:
+                stats[name]["rows"] += 2 ** len(variables)
+            stats[name]["seconds"] += time.perf_counter() - start
+
+    reference_name = ENGINES[0][0]
+    reference = results[reference_name]
+    if "error" in reference:
+        return [f"{reference_name} failed: {reference['error']}"]
+
+    mismatches = []
+    for name, result in results.items():
+        if name == reference_name:
+            continue
+        if "error" in result:
+            mismatches.append(f"{name} failed: {result['error']}")
+            continue
+        if result["valid"] != reference["valid"]:
+            mismatches.append(f"{name} validity {result['valid']} != {reference['valid']}")
+        if result["rows"] is not None and result["rows"] != reference["rows"]:
+            first = min(set(result["rows"]) ^ set(reference["rows"]))
+            mismatches.append(f"{name} valid rows differ ({len(result['rows'])} vs {len(reference['rows'])} rows, "
+                              f"first difference at row {first})")
+        if result["counts"] is not None and result["counts"] != reference["counts"]:
+            first = next(variables[j] for j, pair in enumerate(result["counts"]) if pair != reference["counts"][j])
+            mismatches.append(f"{name} per-variable counts differ (first at {first})")
+        # Table engines must reproduce every cell: premise values, All_Premises, conclusion columns,
+        # Premises_0s/Premises_1s, in Index order
+        if "table" in result and result["table"] != reference["table"]:
+            row = next(a for a, b in zip(result["table"], reference["table"]) if a != b)
+            mismatches.append(f"{name} table differs first at Index {row[0]}")
+    return mismatches
+
+def random_formula(rng, num_vars, depth):
+    """Build a random formula tree over variable indices 0..num_vars-1"""
+    if depth == 0 or rng.random() < 0.3:
+        return ('var', rng.randrange(num_vars))
+    op = rng.choice(RANDOM_OPERATORS)
+    if op == 'not':
+        return ('not', random_formula(rng, num_vars, depth - 1))
+    return (op, random_formula(rng, num_vars, depth - 1), random_formula(rng, num_vars, depth - 1))
+
+def random_instance(rng, max_vars, max_premises, max_depth):
+    """Build a random instance of formula trees (check_parser tests the parser against the same trees)"""
+    num_vars = rng.randint(1, max_vars)
+    if rng.random() < 0.5:
+        variables = [chr(ord('A') + i) for i in range(num_vars)]
+    else:
+        variables = [f"x{i + 1}" for i in range(num_vars)]
+    premise_nodes = [random_formula(rng, num_vars, max_depth) for _ in range(rng.randint(1, max_premises))]
+    return premise_nodes, random_formula(rng, num_vars, max_depth), variables
+
+def render_minimal(node, variables):
+    """Render a formula tree with only the parentheses the intended grammar requires
+
+    This is the harness's own statement of the grammar, kept independent of cl4.BINARY_OPERATORS:
+    ¬ binds tightest, then ⊕, ∧, ∨, →, ↔; ⊕, ∧ and ∨ group to the left, → and ↔ to the right.
+    """
+    kind = node[0]
+    if kind == 'var':
+        return variables[node[1]]
+    if kind == 'not':
+        operand = render_minimal(node[1], variables)
+        return f"¬{operand}" if node[1][0] in ('var', 'not') else f"¬({operand})"
+    precedence = GRAMMAR_PRECEDENCE[kind]
+    right_assoc = kind in RIGHT_ASSOCIATIVE
+
+    def operand(child, on_right):
+        text = render_minimal(child, variables)
+        if child[0] in ('var', 'not'):
+            return text
+        child_precedence = GRAMMAR_PRECEDENCE[child[0]]
+        if child_precedence < precedence or (child_precedence == precedence and on_right != right_assoc):
+            return f"({text})"
+        return text
+
+    return f"{operand(node[1], False)} {GRAMMAR_SYMBOLS[kind]} {operand(node[2], True)}"
+
+def parser_mismatch(node, variables):
+    """Return a description if cl4's parser does not read the minimal text back as the same tree, else None"""
+    text = render_minimal(node, variables)
+    try:
+        parsed = parse_formula(text, build_symbol_table(variables))
+    except ValueError as e:
+        return f"'{text}' failed to parse: {e}"
+    if parsed != node:
+        return f"'{text}' parsed as {formula_to_text(parsed, variables)}, expected {formula_to_text(node, variables)}"
+    return None
+
+def minimize_parser_case(node, variables):
+    """Greedily shrink a formula while the parser still misreads it"""
+    changed = True
+    while changed:
+        changed = False
+        for smaller in smaller_formulas(node):
+            if parser_mismatch(smaller, variables):
+                node, changed = smaller, True
+                break
+    return node
+
+def load_instance(filename):
+    """Read an input file into (premise trees, conclusion tree, variables)"""
+    premises, conclusion, variables = read_input_file(filename)
+    symbols = build_symbol_table(variables)
+    return [parse_formula(premise, symbols) for premise in premises], parse_formula(conclusion, symbols), variables
+
+def subtree_paths(node, path=()):
+    """Yield (path, subtree) for every subtree of a formula tree"""
+    yield path, node
+    if node[0] != 'var':
+        for i, child in enumerate(node[1:], 1):
+            yield from subtree_paths(child, path + (i,))
+
+def replace_subtree(node, path, new):
+    """Return a copy of node with the subtree at path replaced by new"""
+    if not path:
+        return new
+    parts = list(node)
+    parts[path[0]] = replace_subtree(node[path[0]], path[1:], new)
+    return tuple(parts)
+
+def smaller_formulas(node):
+    """Yield strictly smaller variants of a formula: each operator node replaced by one of its operands or a variable"""
+    for path, subtree in subtree_paths(node):
+        if subtree[0] == 'var':
+            continue
+        for child in subtree[1:]:
+            yield replace_subtree(node, path, child)
+        yield replace_subtree(node, path, ('var', 0))
+
+def compact_variables(instance):
+    """Drop variables that no formula mentions and renumber the rest"""
+    premise_nodes, conclusion_node, variables = instance
+    used = set(formula_variables(conclusion_node))
+    for node in premise_nodes:
+        used |= formula_variables(node)
+    mapping = {old: new for new, old in enumerate(sorted(used))}
+
+    def renumber(node):
+        if node[0] == 'var':
+            return ('var', mapping[node[1]])
+        return (node[0],) + tuple(renumber(child) for child in node[1:])
+
+    return [renumber(node) for node in premise_nodes], renumber(conclusion_node), [variables[i] for i in sorted(used)]
+
+def minimize_instance(instance):
+    """Greedily shrink a mismatching instance while the engines still disagree"""
+    def failing(candidate):
+        return bool(run_engines(candidate))
+
+    premise_nodes, conclusion_node, variables = instance
+    changed = True
+    while changed:
+        changed = False
+        # Drop whole premises first (cl4.py needs at least one)
+        for i in range(len(premise_nodes)):
+            if len(premise_nodes) > 1:
+                trial = premise_nodes[:i] + premise_nodes[i + 1:]
+                if failing((trial, conclusion_node, variables)):
+                    premise_nodes, changed = trial, True
+                    break
+        if changed:
+            continue
+        # Then shrink individual formulas; the conclusion is position len(premise_nodes)
+        for i, formula in enumerate(premise_nodes + [conclusion_node]):
+            for smaller in smaller_formulas(formula):
+                if i < len(premise_nodes):
+                    trial = (premise_nodes[:i] + [smaller] + premise_nodes[i + 1:], conclusion_node, variables)
+                else:
+                    trial = (premise_nodes, smaller, variables)
+                if failing(trial):
+                    premise_nodes, conclusion_node, _ = trial
+                    changed = True
+                    break
+            if changed:
+                break
+
+    compacted = compact_variables((premise_nodes, conclusion_node, variables))
+    return compacted if failing(compacted) else (premise_nodes, conclusion_node, variables)
+
+def format_instance(instance):
+    """Render an instance in cl4.py input-file format"""
+    premise_nodes, conclusion_node, variables = instance
+    lines = [f"Variables: {{{', '.join(variables)}}}", "Premises:"]
+    lines += [f"{i}) {formula_to_text(node, variables)}" for i, node in enumerate(premise_nodes, 1)]
+    lines.append(f"Conclusion: {formula_to_text(conclusion_node, variables)}")
+    return "\n".join(lines)
+
+def print_throughput(stats, report_filename):
+    """Print per-engine throughput and optionally save it as CSV"""
+    header = ['Engine', 'Instances', 'Rows', 'Seconds', 'Instances_per_second', 'Rows_per_second', 'Mismatches']
+    table = []
+    for name, _, enumerates_rows in ENGINES:
+        entry = stats[name]
+        seconds = entry["seconds"]
+        instance_rate = f"{entry['instances'] / seconds:.1f}" if seconds else "0"
+        if enumerates_rows:
+            rows, row_rate = entry["rows"], f"{entry['rows'] / seconds:.0f}" if seconds else "0"
+        else:
+            # Engines that never enumerate the table have no row throughput
+            rows, row_rate = "n/a", "n/a"
+        table.append([name, entry["instances"], rows, f"{seconds:.3f}", instance_rate, row_rate, entry["mismatches"]])
+
+    print("\nThroughput (rows = truth-table rows covered, n/a for engines that do not enumerate rows):")
+    print("  " + "".join(f"{h:>22}" for h in header))
+    for row in table:
+        print("  " + "".join(f"{str(v):>22}" for v in row))
+
+    if report_filename:
+        try:
+            with open(report_filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(table)
+            print(f"\nThroughput report saved to: {report_filename}")
+        except PermissionError:
+            print(f"\nError: Cannot write to '{report_filename}' - file may be open in another program.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential test of the cl4.py evaluation engines on bundled and random instances.")
+    parser.add_argument('input_files', nargs='*', help="Input files to check (default: the bundled *v-*p-*r.txt instances)")
+    parser.add_argument('--random', type=int, default=1000, help="Number of random instances (default: 1000)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument('--max-vars', type=int, default=8, help="Maximum variables per random instance (default: 8)")
+    parser.add_argument('--max-premises', type=int, default=6, help="Maximum premises per random instance (default: 6)")
+    parser.add_argument('--max-depth', type=int, default=3, help="Maximum formula depth for random instances (default: 3)")
+    parser.add_argument('--report', type=str, help="Save the per-engine throughput table to this CSV file")
+    args = parser.parse_args()
+
+    input_files = args.input_files or sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*v-*p-*r.txt')))
+    stats = {name: {"instances": 0, "rows": 0, "seconds": 0.0, "mismatches": 0} for name, _, _ in ENGINES}
+    failures = 0
+
+    def check(label, instance):
+        mismatches = run_engines(instance, stats)
+        if not mismatches:
+            return 0
+        for name, _, _ in ENGINES:
+            if any(m.startswith(f"{name} ") for m in mismatches):
+                stats[name]["mismatches"] += 1
+        print(f"\nMismatch on {label}:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        print("Minimized instance:")
+        print(format_instance(minimize_instance(instance)))
+        return 1
+
+    for filename in input_files:
+        try:
+            instance = load_instance(filename)
+        except (OSError, ValueError) as e:
+            print(f"Error reading input file '{filename}': {e}")
+            failures += 1
+            continue
+        failures += check(os.path.basename(filename), instance)
+        print(f"Checked {os.path.basename(filename)}")
+
+    def check_parser(label, instance):
+        premise_nodes, conclusion_node, variables = instance
+        for node in premise_nodes + [conclusion_node]:
+            if parser_mismatch(node, variables):
+                print(f"\nParser mismatch on {label}:")
+                print(f"  {parser_mismatch(minimize_parser_case(node, variables), variables)}")
+                return 1
+        return 0
+
+    rng = random.Random(args.seed)
+    parser_failures = 0
+    for n in range(args.random):
+        label = f"random instance {n + 1} (seed {args.seed})"
+        instance = random_instance(rng, args.max_vars, args.max_premises, args.max_depth)
+        parser_failures += check_parser(label, instance)
+        failures += check(label, instance)
+    failures += parser_failures
+    print(f"Checked {args.random} random instances ({parser_failures} parser mismatch(es))")
+
+    print_throughput(stats, args.report)
+    print(f"\n{failures} mismatching instance(s)" if failures else "\nAll engines agree")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import re
+from collections import defaultdict
+
+IDENTIFIER_PATTERN = r'[A-Za-z_][A-Za-z0-9_]*'
+
+# Binary operators from lowest to highest precedence; ¬ binds tighter than all of them
+BINARY_OPERATORS = [('↔', 'iff'), ('→', 'implies'), ('∨', 'or'), ('∧', 'and'), ('⊕', 'xor')]
+
+def variable_sort_key(name):
+    """Natural sort key so that x2 comes before x10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+def build_symbol_table(variables):
+    """Map each variable name to its dense integer index (its column order in the truth table)"""
+    return {var: i for i, var in enumerate(variables)}
+
+def tokenize_logical_expression(expr):
+    """Split a logical expression into identifiers, parentheses and operator symbols"""
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        ch = expr[pos]
+        if ch.isspace():
+            pos += 1
+            continue
+        match = re.match(IDENTIFIER_PATTERN, expr[pos:])
+        if match:
+            tokens.append(match.group(0))
+            pos += match.end()
+        elif ch in '()¬∧∨⊕→↔':
+            tokens.append(ch)
+            pos += 1
+        else:
+            raise ValueError(f"Unexpected character '{ch}' at position {pos} in: {expr}")
+    return tokens
+
+def parse_formula(expr, symbols):
+    """Parse a logical expression into a tree of tuples over variable indices from the symbol table
+
+    Nodes are ('var', index), ('not', node) and (op, left, right) for the operators in
+    BINARY_OPERATORS. ↔ and → group to the right, the others to the left.
+    """
+    tokens = tokenize_logical_expression(expr)
+    pos = [0]
+    
+    def peek():
+        return tokens[pos[0]] if pos[0] < len(tokens) else None
+    
+    def parse_level(level):
+        if level == len(BINARY_OPERATORS):
+            return parse_unary()
+        symbol, op = BINARY_OPERATORS[level]
+        node = parse_level(level + 1)
+        if op in ('iff', 'implies'):
+            if peek() == symbol:
+                pos[0] += 1
+                node = (op, node, parse_level(level))
+            return node
+        while peek() == symbol:
+            pos[0] += 1
+            node = (op, node, parse_level(level + 1))
+        return node
+    
+    def parse_unary():
+        token = peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of expression: {expr}")
+        pos[0] += 1
+        if token == '¬':
+            return ('not', parse_unary())
+        if token == '(':
+            node = parse_level(0)
+            if peek() != ')':
+                raise ValueError(f"Missing ')' in: {expr}")
+            pos[0] += 1
+            return node
+        if token in symbols:
+            return ('var', symbols[token])
+        if re.fullmatch(IDENTIFIER_PATTERN, token):
+            raise ValueError(f"Unknown variable '{token}' in: {expr}")
+        raise ValueError(f"Unexpected '{token}' in: {expr}")
+    
+    node = parse_level(0)
+    if peek() is not None:
+        raise ValueError(f"Unexpected '{peek()}' in: {expr}")
+    return node
+
+def read_input_file(filename):
+    """Read and parse the input file"""
+    premises = []
+    conclusion = None
+    variables = set()
+    
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    
+    # Process each line
+    for line in lines:
+        line = line.strip()
+        # Remove quotes if present
+        if line.startswith('"') and line.endswith('"'):
+            line = line[1:-1]
+        
+        # Skip empty lines and certain keywords
+        if not line or line.startswith('Variables:') or line == 'Premises:':
+            continue
+            
+        # Find premises (numbered lines, including those starting with #)
+        premise_match = re.match(r'#*(\d+)\)\s*(.+)', line)
+        if premise_match:
+            premise = premise_match.group(2).strip()
+            # Only add premises that don't start with # (uncommented ones)
+            if not line.startswith('#'):
+                premises.append(premise)
+                # Extract variables from premise
+                vars_in_premise = re.findall(IDENTIFIER_PATTERN, premise)
+                variables.update(vars_in_premise)
+            continue
+        
+        # Find conclusion
+        conclusion_match = re.match(r'Conclusion:\s*(.+)', line)
+        if conclusion_match:
+            conclusion = conclusion_match.group(1).strip()
+            # Extract variables from conclusion
+            vars_in_conclusion = re.findall(IDENTIFIER_PATTERN, conclusion)
+            variables.update(vars_in_conclusion)
+    
+    return premises, conclusion, sorted(variables, key=variable_sort_key)
+
+def build_tseitin_cnf(premises, conclusion, variables):
+    """Encode premises ∧ ¬conclusion as CNF clauses of integer literals (DIMACS style)"""
+    # Variables get ids 1..n in table order; gate variables are numbered after them
+    symbols = build_symbol_table(variables)
+    clauses = []
+    next_id = [len(variables)]
+    
+    def new_gate():
+        next_id[0] += 1
+        return next_id[0]
+    
+    def encode(node):
+        kind = node[0]
+        if kind == 'var':
+            return node[1] + 1
+        if kind == 'not':
+            return -encode(node[1])
+        a, b = encode(node[1]), encode(node[2])
+        if kind == 'implies':
+            kind, a = 'or', -a
+        g = new_gate()
+        if kind == 'and':
+            clauses.extend([[-g, a], [-g, b], [g, -a, -b]])
+        elif kind == 'or':
+            clauses.extend([[g, -a], [g, -b], [-g, a, b]])
+        elif kind == 'iff':
+            clauses.extend([[-g, -a, b], [-g, a, -b], [g, a, b], [g, -a, -b]])
+        else:
+            clauses.extend([[-g, a, b], [-g, -a, -b], [g, -a, b], [g, a, -b]])
+        return g
+    
+    for premise in premises:
+        clauses.append([encode(parse_formula(premise, symbols))])
+    clauses.append([-encode(parse_formula(conclusion, symbols))])
+    
+    return clauses, next_id[0]
+
+def propagate(occurs, clauses, units, assumptions, start=None):
+    """Assign the unit clauses and assumption literals and propagate; return the assignment, or None on conflict
+
+    If start is given it must be an assignment already closed under propagation; it is extended
+    with the assumptions only (the unit clauses are already part of it).
+    """
+    assigned = set(start) if start is not None else set()
+    queue = []
+    for lit in (assumptions if start is not None else units + assumptions):
+        if -lit in assigned:
+            return None
+        if lit not in assigned:
+            assigned.add(lit)
+            queue.append(lit)
+    
+    # Only clauses containing the negation of a newly assigned literal can become unit or empty
+    while queue:
+        lit = queue.pop()
+        for index in occurs[-lit]:
+            unassigned = None
+            count = 0
+            satisfied = False
+            for other in clauses[index]:
+                if other in assigned:
+                    satisfied = True
+                    break
+                if -other not in assigned:
+                    unassigned = other
+                    count += 1
+            if satisfied:
+                continue
+            if count == 0:
+                return None
+            if count == 1:
+                assigned.add(unassigned)
+                queue.append(unassigned)
+    
+    return assigned
+
+def add_clause(occurs, clauses, units, clause):
+    """Append a clause and index it by literal"""
+    clauses.append(clause)
+    if len(clause) == 1:
+        units.append(clause[0])
+    for lit in clause:
+        occurs[lit].append(len(clauses) - 1)